@@ -7,10 +7,15 @@ Licence: MIT
 
 import argparse
 import logging
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 from tqdm.auto import tqdm
 
 from .iso_map import ISO_MAP
@@ -27,17 +32,41 @@ RETAINED_COLS = [
     "timestamp", "_orig_fname"
 ]
 
+# explicit (nullable) dtypes for retained columns with a known, fixed type (all
+# other columns are inferred); low-cardinality text columns are stored as categoricals
+ACLED_DTYPES = {
+    "iso": "Int16",
+    "iso3": "category",
+    "year": "Int16",
+    "time_precision": "Int8",
+    "event_type": "category",
+    "sub_event_type": "category",
+    "region": "category",
+    "country": "category",
+    "admin1": "category",
+    "admin2": "category",
+    "admin3": "category",
+    "geo_precision": "Int8",
+    "source_scale": "category",
+    "fatalities": "Int32",
+}
+
+OUTPUT_FORMATS = ("csv", "parquet")
+
+SHARD_FNAME_PATTERN = re.compile(r"^(\d{2})-acled.*\.csv$")
+
 LOG = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
-def concat(source_dir):
+def concat(source_dir, out_format="csv"):
     """
     Consolidate and deduplicate ACLED CSV files in a directory.
 
-    Loads multiple ACLED CSV files from `source_dir`, sorts them lexically
+    Loads multiple ACLED CSV files from `source_dir` (in parallel, using one
+    worker thread per file up to the number of CPU cores), sorts them lexically
     by their numerical filename prefix (e.g., '01-acled_*.csv'), and writs
-    the result to `consolidated_acled.csv`.
+    the result to `consolidated_acled.csv` (or `consolidated_acled.parquet`).
 
     Consecutive input files are expected to have temporal overlap in their
     `event_date` values, to avoid accidental data gaps in the consolidated
@@ -48,30 +77,53 @@ def concat(source_dir):
     ----------
     source_dir : str or Path
         Directory containing input ACLED CSV files.
+    out_format : {"csv", "parquet"}, optional
+        File format of the consolidated output. Defaults to "csv".
 
     Returns
     -------
     pd.DataFrame
         The consolidated ACLED dataset.
+
+    Raises
+    ------
+    ValueError
+        If `out_format` is not a supported output format.
     """
+    if out_format not in OUTPUT_FORMATS:
+        raise ValueError(
+            f"Unsupported output format '{out_format}'. "
+            f"Choose one of: {', '.join(OUTPUT_FORMATS)}."
+        )
+
     source_dir = Path(source_dir)
-    out_path = source_dir / "consolidated_acled.csv"
+    out_path = source_dir / f"consolidated_acled.{out_format}"
 
     shard_paths = _get_lexically_sorted_csv_paths(source_dir)
 
     LOG.info("Loading CSVs...")
-    load_pbar = tqdm(shard_paths, leave=False)
-    dataframes = [_load_and_format_df(path) for path in load_pbar]
+    max_workers = min(len(shard_paths), os.cpu_count() or 1)
+    dataframes = [None] * len(shard_paths)
+    date_ranges = [None] * len(shard_paths)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_load_shard, path): i
+            for i, path in enumerate(shard_paths)
+        }
+        # advance the progress bar as files finish loading (in any order)
+        for future in tqdm(as_completed(futures), total=len(futures), leave=False):
+            i = futures[future]
+            dataframes[i], date_ranges[i] = future.result()
 
     LOG.info("Concatenating...")
-    consolidated = dataframes[0]
-    concat_pbar = tqdm(dataframes[1:], leave=False)
-    for next_df in concat_pbar:
-        consolidated = _concat_two_dfs(consolidated, next_df)
-        assert consolidated.duplicated('event_id_cnty').sum() == 0
+    _check_temporal_overlap(dataframes, date_ranges)
+    consolidated = _concat_and_deduplicate(dataframes)
 
     LOG.info(f"Writing result to {out_path}...")
-    consolidated.to_csv(out_path, index=False)
+    if out_format == "parquet":
+        _write_parquet(consolidated, out_path)
+    else:
+        _write_csv(consolidated, out_path)
 
     LOG.info(f"Done. {len(shard_paths)} ACLED files consolidated.")
     return consolidated
@@ -104,7 +156,6 @@ def _get_lexically_sorted_csv_paths(source_dir):
           (except for an old output file)
     """
     all_csvs = list(Path(source_dir).glob("*.csv"))
-    pattern = re.compile(r"^(\d{2})-acled.*\.csv$")
 
     valid_files = []
     invalid_files = []
@@ -113,7 +164,7 @@ def _get_lexically_sorted_csv_paths(source_dir):
         if path.name.startswith('consolidated_acled'):
             continue  # skip known output files
 
-        match = pattern.match(path.name)
+        match = SHARD_FNAME_PATTERN.match(path.name)
         if match:
             prefix = int(match.group(1))
             valid_files.append((prefix, path))
@@ -142,56 +193,184 @@ def _get_lexically_sorted_csv_paths(source_dir):
     return sorted_paths
 
 
-def _concat_two_dfs(df1, df2):
+def _check_temporal_overlap(dataframes, date_ranges):
     """
-    Concatenate two ACLED DataFrames with overlapping date ranges and remove
-    duplicated event records.
+    Check that consecutive ACLED DataFrames have overlapping date ranges.
+
+    Parameters
+    ----------
+    dataframes : List[pd.DataFrame]
+        ACLED DataFrames, ordered from oldest to newest.
+    date_ranges : List[Tuple[pd.Timestamp, pd.Timestamp]]
+        The `(min, max)` range of event dates of each DataFrame, as computed
+        once at load time (see `_load_shard`).
+
+    Raises
+    ------
+    RuntimeError
+        If any input is empty or if consecutive shards are not temporally
+        contiguous or overlapping.
+    """
+    if any(len(df.index) == 0 for df in dataframes):
+        raise RuntimeError("Cannot merge empty ACLED shards.")
+
+    for (_, max1), (min2, _) in zip(date_ranges[:-1], date_ranges[1:]):
+        if max1 < min2:
+            raise RuntimeError(
+                "ACLED shards must have overlapping dates to avoid data gaps."
+            )
+
+
+def _concat_and_deduplicate(dataframes):
+    """
+    Concatenate ACLED DataFrames and remove duplicated event records.
 
     Assumes each event is uniquely identified by `event_id_cnty`, and that
     `timestamp` reflects the latest edit time. Events with the same ID are
-    deduplicated by retaining the version with the most recent timestamp.
+    deduplicated by retaining the version with the most recent timestamp
+    (found via a hash-based groupby rather than a full sort). All shards are
+    concatenated in one go, so that deduplication runs once over the full
+    data rather than once per shard.
 
     Parameters
     ----------
-    df1 : pd.DataFrame
-        First ACLED DataFrame to concatenate.
-    df2 : pd.DataFrame
-        Second ACLED DataFrame to concatenate.
+    dataframes : List[pd.DataFrame]
+        ACLED DataFrames to concatenate, ordered from oldest to newest.
 
     Returns
     -------
     pd.DataFrame
         The merged, deduplicated DataFrame.
-
-    Raises
-    ------
-    RuntimeError
-        If either input is empty or if the shards are not temporally contiguous or overlapping.
     """
-    if df1.empty or df2.empty:
-        raise RuntimeError("Cannot merge empty ACLED shards.")
-
-    max1 = df1.event_date.max()
-    min2 = df2.event_date.min()
+    _unify_categories(dataframes)
+    df = pd.concat(dataframes, ignore_index=True)
+
+    # rows are visited in reverse, so that ties on `timestamp` are resolved
+    # in favour of the record from the later shard (missing event IDs are
+    # treated as one group, as `drop_duplicates` would do); records without a
+    # `timestamp` lose against any version of the same event that has one
+    reversed_df = df[::-1]
+    latest_idx = (
+        reversed_df["timestamp"]
+        .fillna(-1)
+        .groupby(reversed_df["event_id_cnty"], sort=False, observed=True, dropna=False)
+        .idxmax()
+        .to_numpy()
+    )
 
-    if max1 < min2:
-        raise RuntimeError(
-            "ACLED shards must have overlapping dates to avoid data gaps."
-        )
+    # index labels equal row positions here (see `ignore_index` above); only
+    # the sort keys of retained rows are sorted, so that the full frame is
+    # gathered just once, directly in its final order
+    sort_keys = df[["event_date", "event_id_cnty"]].take(latest_idx)
+    final_order = sort_keys.sort_values(["event_date", "event_id_cnty"]).index
 
-    df = pd.concat([df1, df2])
-    df.sort_values(["event_id_cnty", "timestamp"], inplace=True)
-    df.drop_duplicates(["event_id_cnty"], keep="last", inplace=True)
-    df.sort_values(["event_date", "event_id_cnty"], inplace=True)
+    df = df.take(final_order)
     df.reset_index(drop=True, inplace=True)
     return df
 
 
+def _unify_categories(dataframes):
+    """
+    Cast categorical columns to a dtype that is shared by all DataFrames.
+
+    `pd.concat` only keeps a column categorical if its categories are identical
+    across all inputs, and otherwise falls back to (much larger) object columns.
+    Columns are modified in place.
+
+    Parameters
+    ----------
+    dataframes : List[pd.DataFrame]
+        ACLED DataFrames that are about to be concatenated.
+    """
+    cat_cols = {
+        col for df in dataframes for col in df.select_dtypes("category").columns
+    }
+
+    for col in cat_cols:
+        categories = pd.Index([])
+        for df in dataframes:
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                categories = categories.union(df[col].cat.categories)
+            else:
+                categories = categories.union(df[col].dropna().unique())
+
+        shared_dtype = pd.CategoricalDtype(categories)
+        for df in dataframes:
+            df[col] = df[col].astype(shared_dtype)
+
+
+def _write_csv(df, out_path):
+    """
+    Write an ACLED DataFrame to CSV using pyarrow's multi-threaded CSV writer.
+
+    The DataFrame is converted to an Arrow table once, with `event_date`
+    stored as a calendar date so that it is written without a time component.
+    Note that, unlike `DataFrame.to_csv`, pyarrow encloses the header and all
+    text values in double quotes.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        ACLED DataFrame to write.
+    out_path : Path
+        Destination path of the CSV file.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    date_idx = table.schema.get_field_index("event_date")
+    table = table.set_column(date_idx, "event_date", table["event_date"].cast(pa.date32()))
+    pa_csv.write_csv(table, out_path)
+
+
+def _write_parquet(df, out_path):
+    """
+    Write an ACLED DataFrame to a zstd-compressed Parquet file.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        ACLED DataFrame to write.
+    out_path : Path
+        Destination path of the Parquet file.
+    """
+    df.to_parquet(
+        out_path,
+        engine="pyarrow",
+        compression="zstd",
+        index=False,
+        row_group_size=500_000
+    )
+
+
+def _load_shard(path):
+    """
+    Load a single ACLED CSV file and compute the range of its event dates.
+
+    The date range is computed once here, so that the overlap check in
+    `concat` does not need to re-scan `event_date`.
+
+    Parameters
+    ----------
+    path : Path
+        Path to a single ACLED CSV file.
+
+    Returns
+    -------
+    Tuple[pd.DataFrame, Tuple[pd.Timestamp, pd.Timestamp]]
+        The formatted DataFrame (see `_load_and_format_df`), and the
+        `(min, max)` range of its event dates.
+    """
+    df = _load_and_format_df(path)
+    return df, (df.event_date.min(), df.event_date.max())
+
+
 def _load_and_format_df(path):
     """
     Load and format a single ACLED CSV file.
 
-    Parses dates and appends a provenance column (`_orig_fname`) for traceability.
+    Parses the file with pyarrow's multi-threaded CSV reader, skipping any
+    columns not listed in `RETAINED_COLS`, and then applies the known column
+    types from `ACLED_DTYPES`. Also parses dates and appends a provenance
+    column (`_orig_fname`) for traceability.
     Delegates standardisation and schema validation to `_format_df`.
 
     Parameters
@@ -204,8 +383,20 @@ def _load_and_format_df(path):
     pd.DataFrame
         A cleaned and formatted DataFrame.
     """
-    df = pd.read_csv(path, low_memory=False, parse_dates=["event_date"])
-    df['_orig_fname'] = path.name  # track provenance
+    # only parse retained columns (which may or may not include `iso3`)
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [col for col in header if col in RETAINED_COLS]
+
+    df = pd.read_csv(path, engine="pyarrow", usecols=usecols, parse_dates=["event_date"])
+
+    # apply known column types after parsing (passing them to `read_csv` makes
+    # the pyarrow engine fail on blank cells in integer-like columns)
+    df = df.astype({col: dtype for col, dtype in ACLED_DTYPES.items() if col in df})
+
+    # track provenance (as a categorical, since all rows share one value)
+    df['_orig_fname'] = pd.Categorical.from_codes(
+        np.zeros(len(df), dtype=np.int8), categories=[path.name]
+    )
     return _format_df(df)
 
 
@@ -214,7 +405,8 @@ def _format_df(df):
     Standardise an ACLED dataframe by adding a missing ISO3 column if needed.
 
     Ensures all required columns exist, adds missing `iso3` codes (if needed),
-    and enforces a fixed schema by subsetting to a known column set.
+    converts a float- or date-valued `timestamp` column to integer Unix epoch
+    seconds, and enforces a fixed schema by subsetting to a known column set.
 
     Parameters
     ----------
@@ -235,19 +427,61 @@ def _format_df(df):
     # very old ACLED files only provide numerical country codes, which we
     # convert to three-letter country codes for compatibility
     if "iso3" not in df.columns:
-        if unknown := set(df.iso) - set(ISO_MAP.keys()):
+        iso_lut = _build_iso_lut(ISO_MAP)
+        iso_codes = df["iso"].to_numpy(dtype=np.int64, na_value=-1)
+        clipped_codes = np.clip(iso_codes, 0, len(iso_lut) - 1)
+        iso3_codes = iso_lut[clipped_codes]
+
+        unmapped = (iso_codes != clipped_codes) | pd.isna(iso3_codes)
+        if unknown := set(df["iso"][unmapped].drop_duplicates().tolist()):
             raise ValueError(
                 "The following numerical ISO codes could not be mapped "
                 f"to a three-letter equivalent: {unknown}."
             )
 
-        df["iso3"] = df["iso"].map(ISO_MAP)
+        df["iso3"] = pd.Categorical(iso3_codes)
 
     # ensure required columns exist
     if missing_cols := set(RETAINED_COLS) - set(df.columns):
         raise ValueError(f"Missing expected columns: {missing_cols}")
 
-    return df[RETAINED_COLS].copy()
+    # `timestamp` is normally a Unix epoch integer, but may be parsed as float
+    # (e.g. due to blank cells) or come as a date; both are converted to
+    # (nullable) integer epoch seconds to keep comparisons integer-based
+    timestamps = df["timestamp"]
+    if pd.api.types.is_float_dtype(timestamps):
+        df["timestamp"] = timestamps.astype("Int64")
+    elif not pd.api.types.is_integer_dtype(timestamps):
+        elapsed = pd.to_datetime(timestamps).dt.as_unit("s") - pd.Timestamp(0)
+        df["timestamp"] = (elapsed // pd.Timedelta(seconds=1)).astype("Int64")
+
+    # reorder only, without an explicit defensive copy (the parsed frame is not
+    # shared); note that `reindex` is only a lazy view under copy-on-write (the
+    # default from pandas 3), and still copies on pandas 2.x without it
+    return df.reindex(columns=RETAINED_COLS)
+
+
+def _build_iso_lut(iso_map):
+    """
+    Build a lookup array that maps numerical ISO codes to three-letter codes.
+
+    Position `i` of the returned array holds the three-letter code for the
+    numerical ISO code `i`, or None if `i` is not a known code. Indexing this
+    array with a column of numerical codes maps all rows in one vectorised step.
+
+    Parameters
+    ----------
+    iso_map : dict
+        Mapping from numerical ISO codes to three-letter ISO codes.
+
+    Returns
+    -------
+    np.ndarray
+        Object array of length `max(iso_map) + 1`.
+    """
+    iso_lut = np.full(max(iso_map) + 1, None, dtype=object)
+    iso_lut[list(iso_map.keys())] = list(iso_map.values())
+    return iso_lut
 
 
 def main():
@@ -271,10 +505,18 @@ def main():
         help="Directory containing ACLED source files"
     )
 
+    parser.add_argument(
+        "--format",
+        dest="out_format",
+        choices=OUTPUT_FORMATS,
+        default="csv",
+        help="File format of the consolidated output (default: csv)"
+    )
+
     args = parser.parse_args()
 
     try:
-        concat(args.source_dir)
+        concat(args.source_dir, out_format=args.out_format)
     except Exception as e:
         import traceback
         LOG.error(f"Failed to consolidate ACLED data: {e}")
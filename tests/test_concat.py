@@ -66,6 +66,20 @@ def mock_shard3(tmp_path):
     return fname
 
 
+@pytest.fixture
+def mock_shard2_same_dates(tmp_path):
+    # covers exactly the same date range as `mock_shard1`
+    shard2 = pd.DataFrame({
+        "event_id_cnty": ['ABC01', 'XYZ01'],
+        "event_date": [pd.Timestamp('1 Jan 2020'), pd.Timestamp('31 Dec 2020')],
+        "timestamp": [9, 9],
+        "iso": [123, 456],
+    })
+    fname = tmp_path / f"02-acled_mock.csv"
+    shard2.to_csv(fname, index=False)
+    return fname
+
+
 def test_load_and_format_df(tmp_path, mock_shard1):
     from acled_concat import cli
 
@@ -87,6 +101,94 @@ def test_load_and_format_df(tmp_path, mock_shard1):
     assert pd.api.types.is_datetime64_any_dtype(df["event_date"])
 
 
+def test_load_and_format_df_converts_date_timestamps(tmp_path, mock_shard3):
+    from acled_concat import cli
+
+    cli.RETAINED_COLS = TEST_RETAINED_COLS
+    cli.ISO_MAP = TEST_ISO_MAP
+
+    df = cli._load_and_format_df(mock_shard3)
+
+    assert pd.api.types.is_integer_dtype(df["timestamp"])
+    assert df["timestamp"].iloc[0] == pd.Timestamp('31 Dec 2099').timestamp()
+
+
+def test_load_and_format_df_tolerates_blank_integer_cells(tmp_path):
+    from acled_concat import cli
+
+    cli.RETAINED_COLS = TEST_RETAINED_COLS
+    cli.ISO_MAP = TEST_ISO_MAP
+
+    # `iso` has a blank cell, which is harmless when `iso3` is provided
+    fname = tmp_path / "01-acled_mock.csv"
+    fname.write_text(
+        "event_id_cnty,event_date,timestamp,iso,iso3\n"
+        "ABC01,2020-01-01,1,123,ABC\n"
+        "XYZ01,2020-01-02,1,,XYZ\n"
+    )
+
+    df = cli._load_and_format_df(fname)
+
+    assert df["iso"].dtype == "Int16"
+    assert df["iso"].isna().tolist() == [False, True]
+    assert np.all(df["iso3"] == ["ABC", "XYZ"])
+
+
+def test_concat_handles_float_timestamps(tmp_path):
+    from acled_concat import cli
+
+    cli.RETAINED_COLS = TEST_RETAINED_COLS
+    cli.ISO_MAP = TEST_ISO_MAP
+
+    # float epoch timestamps (incl. a blank cell) in the older shard
+    pd.DataFrame({
+        "event_id_cnty": ['ABC01', 'ABC02'],
+        "event_date": [pd.Timestamp('1 Jan 2020'), pd.Timestamp('2 Jan 2020')],
+        "timestamp": [1700000000.0, np.nan],
+        "iso": [123, 123],
+    }).to_csv(tmp_path / "01-acled_mock.csv", index=False)
+    pd.DataFrame({
+        "event_id_cnty": ['ABC01', 'ABC02'],
+        "event_date": [pd.Timestamp('1 Jan 2020'), pd.Timestamp('2 Jan 2020')],
+        "timestamp": [1600000000, 1600000000],
+        "iso": [123, 123],
+    }).to_csv(tmp_path / "02-acled_mock.csv", index=False)
+
+    result_df = cli.concat(tmp_path)
+
+    # the newer float-valued record wins; the blank one loses
+    assert result_df.timestamp.tolist() == [1700000000, 1600000000]
+    assert result_df['_orig_fname'].tolist() == ['01-acled_mock.csv', '02-acled_mock.csv']
+
+
+def test_load_and_format_df_raises_for_unknown_iso(tmp_path, mock_shard1):
+    from acled_concat import cli
+
+    cli.RETAINED_COLS = TEST_RETAINED_COLS
+    cli.ISO_MAP = {123: 'ABC'}
+
+    with pytest.raises(ValueError) as exc_info:
+        cli._load_and_format_df(mock_shard1)
+
+    assert "{456}" in str(exc_info.value)
+
+
+def test_load_and_format_df_skips_unused_columns(tmp_path, mock_shard1):
+    from acled_concat import cli
+
+    cli.RETAINED_COLS = TEST_RETAINED_COLS
+    cli.ISO_MAP = TEST_ISO_MAP
+
+    # add a column that is not part of the (test) schema
+    shard = pd.read_csv(mock_shard1)
+    shard["unused"] = "foo"
+    shard.to_csv(mock_shard1, index=False)
+
+    df = cli._load_and_format_df(mock_shard1)
+
+    assert list(df.columns) == TEST_RETAINED_COLS
+
+
 def test_concat_merges_and_deduplicates(tmp_path, mock_shard1, mock_shard2):
     from acled_concat import cli
 
@@ -107,6 +209,104 @@ def test_concat_merges_and_deduplicates(tmp_path, mock_shard1, mock_shard2):
     assert len(result_df[result_df.timestamp == 9]) == 4
 
 
+def test_deduplication_prefers_later_shard_on_equal_timestamps():
+    from acled_concat import cli
+
+    older = pd.DataFrame({
+        "event_id_cnty": ['ABC01', 'ABC02'],
+        "event_date": [pd.Timestamp('1 Jan 2020'), pd.Timestamp('2 Jan 2020')],
+        "timestamp": [5, 5],
+        "_orig_fname": ['01-acled_mock.csv'] * 2,
+    })
+    newer = older.assign(_orig_fname='02-acled_mock.csv')
+
+    result_df = cli._concat_and_deduplicate([older, newer])
+
+    assert len(result_df) == 2
+    assert np.all(result_df['_orig_fname'] == '02-acled_mock.csv')
+
+
+def test_concat_does_not_leak_shard_attrs(tmp_path, mock_shard1, mock_shard2_same_dates):
+    from acled_concat import cli
+
+    cli.RETAINED_COLS = TEST_RETAINED_COLS
+    cli.ISO_MAP = TEST_ISO_MAP
+
+    result_df = cli.concat(tmp_path)
+
+    assert result_df.attrs == {}
+    assert len(result_df) == 3
+
+
+def test_deduplication_keeps_records_with_missing_ids():
+    from acled_concat import cli
+
+    older = pd.DataFrame({
+        "event_id_cnty": ['A', None],
+        "event_date": [pd.Timestamp('1 Jan 2020'), pd.Timestamp('2 Jan 2020')],
+        "timestamp": [1, 1],
+        "_orig_fname": ['01-acled_mock.csv'] * 2,
+    })
+    newer = older.assign(timestamp=9, _orig_fname='02-acled_mock.csv')
+
+    result_df = cli._concat_and_deduplicate([older, newer])
+
+    # as with `drop_duplicates`, missing IDs are deduplicated amongst each other
+    assert len(result_df) == 2
+    assert result_df.event_id_cnty.isna().tolist() == [False, True]
+    assert np.all(result_df.timestamp == 9)
+
+
+def test_concat_writes_consolidated_csv(tmp_path, mock_shard1, mock_shard2):
+    from acled_concat import cli
+
+    cli.RETAINED_COLS = TEST_RETAINED_COLS
+    cli.ISO_MAP = TEST_ISO_MAP
+
+    result_df = cli.concat(tmp_path)
+    written_df = pd.read_csv(tmp_path / "consolidated_acled.csv")
+
+    assert list(written_df.columns) == TEST_RETAINED_COLS
+    assert np.all(written_df.event_id_cnty == result_df.event_id_cnty)
+    assert written_df.event_date.iloc[0] == "2020-01-01"
+
+    # header names (and text values) are quoted by pyarrow's CSV writer
+    with open(tmp_path / "consolidated_acled.csv") as f:
+        header, first_row = f.readline().strip(), f.readline().strip()
+    assert header == ",".join(f'"{col}"' for col in TEST_RETAINED_COLS)
+    assert first_row.startswith('"ABC01",')
+
+
+def test_concat_writes_parquet(tmp_path, mock_shard1, mock_shard2):
+    from acled_concat import cli
+
+    cli.RETAINED_COLS = TEST_RETAINED_COLS
+    cli.ISO_MAP = TEST_ISO_MAP
+
+    result_df = cli.concat(tmp_path, out_format="parquet")
+    written_df = pd.read_parquet(tmp_path / "consolidated_acled.parquet")
+
+    assert not (tmp_path / "consolidated_acled.csv").exists()
+    assert list(written_df.columns) == TEST_RETAINED_COLS
+    assert np.all(written_df.event_id_cnty == result_df.event_id_cnty)
+
+
+def test_concat_writes_parquet_for_shards_with_same_dates(
+        tmp_path, mock_shard1, mock_shard2_same_dates
+):
+    from acled_concat import cli
+
+    cli.RETAINED_COLS = TEST_RETAINED_COLS
+    cli.ISO_MAP = TEST_ISO_MAP
+
+    result_df = cli.concat(tmp_path, out_format="parquet")
+    written_df = pd.read_parquet(tmp_path / "consolidated_acled.parquet")
+
+    assert written_df.attrs == {}
+    assert np.all(written_df.event_id_cnty == result_df.event_id_cnty)
+    assert np.all(written_df.timestamp == [9, 1, 9])
+
+
 def test_concat_raises_without_temporal_overlap(tmp_path, mock_shard1, mock_shard3):
     from acled_concat import cli
 